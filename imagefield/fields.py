@@ -5,13 +5,18 @@ import io
 import logging
 import os
 import re
+import tempfile
+import threading
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from django.conf import settings
 from django.core import checks
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.core.files.base import ContentFile
+from django.core.files.base import File
+from django.core.files.storage import FileSystemStorage
 from django.db import models
 from django.db.models import signals
 from django.db.models.fields import files
@@ -21,7 +26,7 @@ from django.utils.translation import gettext as _
 
 from PIL import Image
 
-from .processing import build_handler
+from .processing import build_handler, draft_size
 from .websafe import websafe
 from .widgets import PPOIWidget, with_preview_and_ppoi
 
@@ -77,8 +82,58 @@ logger = logging.getLogger(__name__)
 IMAGEFIELDS = []
 
 
+#: Bumped whenever the processed-name derivation changes, so that stale
+#: paths are invalidated cleanly instead of colliding with new ones.
+PROCESSED_SCHEME_VERSION = 2
+
+
+@lru_cache(maxsize=1024)
+def _cached_storage_url(storage, name):
+    return storage.url(name)
+
+
+def _storage_url(storage, name):
+    # Filesystem storages map names to URLs deterministically, so those
+    # lookups can be shared across field file instances. Remote backends
+    # may sign URLs with an expiry window; caching them for the process
+    # lifetime would serve dead links, so ask them every time.
+    if isinstance(storage, FileSystemStorage):
+        return _cached_storage_url(storage, name)
+    return storage.url(name)
+
+
+@lru_cache(maxsize=1024)
+def _splitext(name):
+    # Called for the same file names over and over again from the
+    # processed-name derivation.
+    return os.path.splitext(name)
+
+
+@lru_cache(maxsize=1024)
+def _parse_ppoi(value):
+    # PPOI strings repeat endlessly ("0.5x0.5" for almost everything), so
+    # share the split/float work across all field files.
+    return tuple(float(coord) for coord in value.split("x"))
+
+
+@lru_cache(maxsize=256)
+def _processors_signature(processors):
+    # Stringifying the processor spec is surprisingly expensive and the
+    # handful of configured specs repeat for every single image. Formats
+    # cannot be preprocessed at field-configuration time because they may be
+    # overridden in settings and because spec callables rewrite the
+    # processors per context, so memoize by value instead.
+    signature = "|".join(str(p) for p in processors)
+    return re.sub(r"\bu('|\")", "\\1", signature)  # Strip u"" prefixes on PY2
+
+
+@lru_cache(maxsize=1024)
 def hashdigest(str):
-    return hashlib.sha1(str.encode("utf-8")).hexdigest()
+    # BLAKE2b is faster than SHA-1 in software and 128 bits are plenty for
+    # content-addressed paths. Inputs (file names and processor specs)
+    # repeat all the time, e.g. when rendering list views, so memoize the
+    # digests across field file instances.
+    return hashlib.blake2b(str.encode("utf-8"), digest_size=16).hexdigest()
 
 
 class VersatileImageProxy(object):
@@ -118,28 +173,27 @@ class ImageFieldFile(files.ImageFieldFile):
         if item == "field":
             raise AttributeError
         if item in self.field.formats:
-            context = self._process_context(self.field.formats[item])
-            if context.name:
-                url = self.storage.url(context.name)
-            else:
-                url = ""
+            url = self._format_url(item)
             setattr(self, item, url)
             return url
         elif settings.IMAGEFIELD_VERSATILEIMAGEPROXY and item in {"thumbnail", "crop"}:
             return VersatileImageProxy(self, item)
         raise AttributeError
 
+    def _format_url(self, item):
+        context = self._process_context(self.field.formats[item])
+        return _storage_url(self.storage, context.name) if context.name else ""
+
     def _ppoi(self):
         if self.field.ppoi_field:
-            return [
-                float(coord)
-                for coord in getattr(self.instance, self.field.ppoi_field).split("x")
-            ]
+            # Return a fresh list so that callers (and the context) never
+            # share mutable state through the cache.
+            return list(_parse_ppoi(getattr(self.instance, self.field.ppoi_field)))
         return [0.5, 0.5]
 
     def _process_base(self, name):
         p1 = hashdigest(name)
-        filename, _ = os.path.splitext(os.path.basename(name))
+        filename, _ = _splitext(os.path.basename(name))
         return _ProcessBase("__processed__/%s" % p1[:3], "%s-" % filename)
 
     def _process_context(self, processors):
@@ -147,7 +201,7 @@ class ImageFieldFile(files.ImageFieldFile):
         context = Context(
             ppoi=self._ppoi(),
             save_kwargs={},
-            extension=os.path.splitext(name)[1],
+            extension=_splitext(name)[1],
             processors=processors,
             name=name,
             source=name,
@@ -156,11 +210,15 @@ class ImageFieldFile(files.ImageFieldFile):
             context.processors(self, context)
         if context.name:
             base = self._process_base(context.name)
-            spec = (
-                "|".join(str(p) for p in context.processors) + "|" + str(context.ppoi)
+            try:
+                signature = _processors_signature(tuple(context.processors))
+            except TypeError:  # Unhashable processor arguments
+                signature = re.sub(
+                    r"\bu('|\")", "\\1", "|".join(str(p) for p in context.processors)
+                )
+            p2 = hashdigest(
+                "%s|%s|%s" % (PROCESSED_SCHEME_VERSION, signature, context.ppoi)
             )
-            spec = re.sub(r"\bu('|\")", "\\1", spec)  # Strip u"" prefixes on PY2
-            p2 = hashdigest(spec)
             context.name = "%s/%s%s%s" % (
                 base.path,
                 base.basename,
@@ -170,7 +228,20 @@ class ImageFieldFile(files.ImageFieldFile):
         context.seal()
         return context
 
-    def process(self, spec, force=False):
+    def _existing_processed_names(self):
+        # One listdir() round trip instead of one exists() per format. On
+        # remote storages each exists() is a separate HTTP request.
+        base = self._process_base(self.name or self.field._fallback)
+        try:
+            return set(self.storage.listdir(base.path)[1])
+        except EnvironmentError:  # FileNotFoundError on PY3
+            return set()
+        except NotImplementedError:
+            # Not all storages support listdir(); fall back to per-format
+            # exists() checks in process().
+            return None
+
+    def process(self, spec, force=False, existing=None):
         if isinstance(spec, (list, tuple)):
             processors = spec
             spec = "<ad hoc>"
@@ -189,7 +260,10 @@ class ImageFieldFile(files.ImageFieldFile):
             {"image": self, "key": spec, "context": context},
         )
 
-        already_exists = self.storage.exists(context.name)
+        if existing is not None:
+            already_exists = os.path.basename(context.name) in existing
+        else:
+            already_exists = self.storage.exists(context.name)
 
         if not force and already_exists:
             return context.name
@@ -203,14 +277,72 @@ class ImageFieldFile(files.ImageFieldFile):
             if settings.IMAGEFIELD_SILENTFAILURE:
                 return self.name
             raise
+        finally:
+            if not self.__dict__.get("_retain_source"):
+                # Only keep the raw upload around when the caller manages
+                # the cache for a whole batch of formats (as
+                # _generate_files and the management command do); a lone
+                # process() call must not pin it for the instance's
+                # lifetime.
+                self.__dict__.pop("_source_cache", None)
 
         if already_exists:
-            self.storage.delete(context.name)
-        self.storage.save(context.name, ContentFile(buf))
-
-        logger.info('Saved "%(name)s" successfully', {"name": context.name})
+            # Regenerating (e.g. process_imagefields --force) often produces
+            # byte-identical output; skip the delete/save round trip then.
+            try:
+                with self.storage.open(context.name, "rb") as existing_file:
+                    unchanged = existing_file.read() == buf.getbuffer()
+            except EnvironmentError:  # FileNotFoundError on PY3
+                unchanged = False
+            if unchanged:
+                logger.debug('Kept unchanged "%(name)s"', {"name": context.name})
+                return context.name
+
+        self._save_processed(context.name, buf, already_exists)
+
+        logger.debug('Saved "%(name)s" successfully', {"name": context.name})
         return context.name
 
+    def _save_processed(self, name, buf, already_exists):
+        try:
+            path = self.storage.path(name)
+        except (NotImplementedError, AttributeError):
+            path = None
+
+        if path is None:
+            # Storages without filesystem paths cannot rename atomically.
+            if already_exists:
+                self.storage.delete(name)
+            self.storage.save(name, File(buf))
+            return
+
+        # Write to a temporary file next to the target and move it into
+        # place atomically, so that readers never see a missing or
+        # half-written file while regenerating.
+        dirname = os.path.dirname(path)
+        dir_mode = getattr(self.storage, "directory_permissions_mode", None)
+        if dir_mode is not None:
+            # Set the umask because os.makedirs() doesn't apply the "mode"
+            # argument to intermediate-level directories (as
+            # FileSystemStorage._save does).
+            old_umask = os.umask(0o777 & ~dir_mode)
+            try:
+                os.makedirs(dirname, dir_mode, exist_ok=True)
+            finally:
+                os.umask(old_umask)
+        else:
+            os.makedirs(dirname, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=dirname, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(buf.getbuffer())
+            mode = getattr(self.storage, "file_permissions_mode", None)
+            os.chmod(tmp_path, 0o644 if mode is None else mode)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
     def _process(self, processors=None, context=None):
         assert bool(processors) != bool(context), "Pass exactly one, not both"
 
@@ -223,23 +355,48 @@ class ImageFieldFile(files.ImageFieldFile):
             )
             context.seal()
 
-        orig_name = self.name
-        self.name = context.source
-        try:
-            self.open("rb")  # Is a context manager from Django 2.0 onwards
-            image = Image.open(self.file)
+        with self._source_buffer(context.source) as source:
+            image = Image.open(source)
             context.save_kwargs.setdefault("format", image.format)
 
+            if image.format == "JPEG":
+                size = draft_size(context.processors)
+                if size:
+                    # Let the JPEG decoder downscale while decoding instead
+                    # of decoding at full resolution and resizing afterwards.
+                    image.draft(None, size)
+
             handler = build_handler(context.processors)
             image = handler(image, context)
 
-            with io.BytesIO() as buf:
-                image.save(buf, **context.save_kwargs)
-                return buf.getvalue()
-        finally:
-            self.close()
-            del self.file
-            self.name = orig_name
+            # Hand the buffer itself to the caller; .getvalue() would copy
+            # the whole encoded image once more.
+            buf = io.BytesIO()
+            image.save(buf, **context.save_kwargs)
+            buf.seek(0)
+            return buf
+
+    def _source_buffer(self, name):
+        # Lazily read the raw upload from storage, only once, and share the
+        # bytes between the per-format processing runs -- also when those
+        # run on the _generate_files thread pool, hence the lock. The image
+        # is still opened per run -- reusing a decoded image would lose the
+        # format, EXIF and ICC metadata the processors depend upon.
+        lock = self.__dict__.setdefault("_source_lock", threading.Lock())
+        with lock:
+            cached = self.__dict__.get("_source_cache")
+            if cached is None or cached[0] != name:
+                orig_name = self.name
+                self.name = name
+                try:
+                    self.open("rb")  # Is a context manager from Django 2.0
+                    data = self.file.read()
+                finally:
+                    self.close()
+                    del self.file
+                    self.name = orig_name
+                self.__dict__["_source_cache"] = cached = (name, data)
+        return io.BytesIO(cached[1])
 
     @property
     def _image(self):
@@ -270,6 +427,38 @@ class ImageFieldFile(files.ImageFieldFile):
     save.alters_data = True
 
 
+class _FormatDescriptor(object):
+    # Non-data descriptor for statically configured formats; saves the
+    # __getattr__ round trip on the first access, and the URL stored in the
+    # instance dict takes precedence afterwards. Dispatches through
+    # __getattr__ so that runtime format overrides keep working.
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj.__getattr__(self.name)
+
+
+def _specialized_attr_class(cls, field_name, formats):
+    descriptors = {
+        key: _FormatDescriptor(key)
+        for key in formats
+        if str(key).isidentifier() and not hasattr(ImageFieldFile, key)
+    }
+    if not descriptors:
+        return ImageFieldFile
+    class_name = str(
+        "%s_%s_%s_ImageFieldFile" % (cls._meta.app_label, cls.__name__, field_name)
+    )
+    attr_class = type(class_name, (ImageFieldFile,), descriptors)
+    # Register the generated class in this module so that field files
+    # survive pickling and unpickling.
+    globals()[class_name] = attr_class
+    return attr_class
+
+
 def verified(img):
     # Anything which exercises the machinery so that we may
     # find out whether the image works at all (or not)
@@ -329,6 +518,9 @@ class ImageField(models.ImageField):
                 self.ppoi_field = "%s_ppoi" % name
                 PPOIField().contribute_to_class(cls, self.ppoi_field)
 
+        if self._formats:
+            self.attr_class = _specialized_attr_class(cls, name, self._formats)
+
         super(ImageField, self).contribute_to_class(cls, name, **kwargs)
 
         if all((not cls._meta.abstract, not cls._meta.swapped)):
@@ -385,6 +577,12 @@ class ImageField(models.ImageField):
 
         f = getattr(instance, self.name)
 
+        current = (f.name, f._ppoi())
+        if getattr(instance, "_generated_%s" % self.name, None) == current:
+            # Saved again without touching the image or its PPOI; all
+            # formats have already been generated in this process.
+            return
+
         previous = getattr(instance, "_previous_%s" % self.name, None)
         # TODO This will not detect replaced/overwritten files.
         if previous and previous[0] and previous != (f.name, f._ppoi()):
@@ -392,8 +590,36 @@ class ImageField(models.ImageField):
             self._clear_generated_files_for(f, previous[0])
 
         if f.name:
-            for spec in f.field.formats:
-                f.process(spec)
+            existing = f._existing_processed_names()
+            specs = list(f.field.formats)
+            # Share one lazy storage read between the formats. The source
+            # is only fetched once a format actually has to be generated,
+            # and read failures surface inside process() where
+            # IMAGEFIELD_SILENTFAILURE applies.
+            f.__dict__["_retain_source"] = True
+            try:
+                if len(specs) > 1:
+                    # Pillow releases the GIL while decoding and encoding,
+                    # so the formats can be generated concurrently.
+                    with ThreadPoolExecutor(
+                        max_workers=min(len(specs), os.cpu_count() or 1)
+                    ) as executor:
+                        futures = [
+                            executor.submit(f.process, spec, existing=existing)
+                            for spec in specs
+                        ]
+                        for future in futures:
+                            future.result()
+                else:
+                    for spec in specs:
+                        f.process(spec, existing=existing)
+            finally:
+                # Do not pin the raw upload in memory for the lifetime of
+                # the instance.
+                f.__dict__.pop("_retain_source", None)
+                f.__dict__.pop("_source_cache", None)
+
+        setattr(instance, "_generated_%s" % self.name, current)
 
     def _clear_generated_files(self, instance, **kwargs):
         self._clear_generated_files_for(getattr(instance, self.name), None)
@@ -1,21 +1,69 @@
 from __future__ import division, unicode_literals
 
+import os
 import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
+from django.apps import apps
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
 
 from imagefield.fields import IMAGEFIELDS
 
 
-def iterator(queryset):
-    # Relatively low chunk_size to avoid slowness when having to load
-    # width and height for images when instantiating models.
+def iterator(queryset, chunk_size=100):
     try:
-        return queryset.iterator(chunk_size=100)
+        return queryset.iterator(chunk_size=chunk_size)
     except TypeError:  # Older versions of Django
         return queryset.iterator()
 
 
+def _process_one(app_label, model_name, field_name, pk, force, housekeep):
+    # Runs in a worker process. Resolve the field from scratch so that the
+    # task tuples stay cheap to pickle.
+    if not apps.ready:  # pragma: no cover ("spawn" multiprocessing start method)
+        import django
+
+        django.setup()
+
+    model = apps.get_model(app_label, model_name)
+    field = model._meta.get_field(field_name)
+    # Load the image and PPOI plus width/height so that the save below can
+    # fill in the dimension fields, but skip unrelated (and possibly wide)
+    # columns.
+    fields_to_load = [field.name]
+    for name in [field.ppoi_field, field.width_field, field.height_field]:
+        if name:
+            fields_to_load.append(name)
+    instance = model._default_manager.only(*fields_to_load).get(pk=pk)
+    fieldfile = getattr(instance, field_name)
+
+    errors = []
+    existing = fieldfile._existing_processed_names()
+    # Share one lazy storage read between the formats.
+    fieldfile.__dict__["_retain_source"] = True
+    for key in field.formats:
+        try:
+            fieldfile.process(key, force=force, existing=existing)
+        except Exception as exc:
+            errors.append(
+                "Error while processing {} ({}, #{}):\n{}\n".format(
+                    fieldfile.name, field.field_label, pk, exc
+                )
+            )
+            if housekeep == "blank-on-failure":
+                field.save_form_data(instance, "")
+
+    fieldfile.__dict__.pop("_retain_source", None)
+    fieldfile.__dict__.pop("_source_cache", None)
+
+    # Save instance once for good measure; fills in width/height
+    # if not done already
+    instance._skip_generate_files = True
+    instance.save()
+    return errors
+
+
 class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument(
@@ -70,46 +118,71 @@ class Command(BaseCommand):
         queryset = field.model._default_manager.exclude(**{field.name: ""}).order_by(
             "-pk"
         )
-        count = queryset.count()
         self.stdout.write(
-            "%s - %s objects - %s"
+            "%s - %s"
             % (
                 field.field_label,
-                count,
                 ", ".join(sorted(field.formats.keys())) or "<no formats!>",
             )
         )
-        self.stdout.write("\r|%s| %s/%s" % (" " * 50, 0, count), ending="")
 
         if field._fallback:
             self._process_instance(
                 field.model(), field, housekeep=None, force=options.get("force"),
             )
 
-        for index, instance in enumerate(iterator(queryset)):
-            self._process_instance(
-                instance,
-                field,
-                housekeep=options.get("housekeep"),
-                force=options.get("force"),
-            )
-            progress = "*" * (50 * index // count)
-            self.stdout.write(
-                "\r|%s| %s/%s" % (progress.ljust(50), index + 1, count), ending=""
-            )
+        # Image processing is CPU-bound and Pillow holds the GIL, so fan the
+        # work out over processes, one task per instance. Workers open their
+        # own database connections.
+        connections.close_all()
+        max_workers = os.cpu_count() or 1
+        pending = set()
+        processed = 0
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # Stream primary keys instead of materializing (and counting)
+            # the whole table, and only keep a bounded window of tasks in
+            # flight so that memory stays bounded too.
+            for pk in iterator(queryset.values_list("pk", flat=True), chunk_size=2000):
+                if len(pending) >= 2 * max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    processed = self._drain(done, processed)
+                pending.add(
+                    executor.submit(
+                        _process_one,
+                        field.model._meta.app_label,
+                        field.model._meta.model_name,
+                        field.name,
+                        pk,
+                        options.get("force"),
+                        options.get("housekeep"),
+                    )
+                )
 
-            # Save instance once for good measure; fills in width/height
-            # if not done already
-            instance._skip_generate_files = True
-            instance.save()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                processed = self._drain(done, processed)
 
-        self.stdout.write("\r|%s| %s/%s" % ("*" * 50, count, count))
+        self.stdout.write("\r%s processed" % processed)
+
+    def _drain(self, done, processed):
+        for future in done:
+            try:
+                errors = future.result()
+            except Exception as exc:
+                errors = ["Error in worker:\n{}\n".format(exc)]
+            for error in errors:
+                self.stderr.write(error)
+            processed += 1
+            self.stdout.write("\r%s processed" % processed, ending="")
+        return processed
 
     def _process_instance(self, instance, field, housekeep, **kwargs):
         fieldfile = getattr(instance, field.name)
+        existing = fieldfile._existing_processed_names()
+        fieldfile.__dict__["_retain_source"] = True
         for key in field.formats:
             try:
-                fieldfile.process(key, **kwargs)
+                fieldfile.process(key, existing=existing, **kwargs)
             except Exception as exc:
                 self.stderr.write(
                     "Error while processing {} ({}, #{}):\n{}\n".format(
@@ -118,3 +191,5 @@ class Command(BaseCommand):
                 )
                 if housekeep == "blank-on-failure":
                     field.save_form_data(instance, "")
+        fieldfile.__dict__.pop("_retain_source", None)
+        fieldfile.__dict__.pop("_source_cache", None)
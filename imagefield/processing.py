@@ -5,6 +5,42 @@ from PIL import Image
 
 PROCESSORS = {}
 
+#: Processors which never enlarge the image or inspect full-resolution
+#: pixels, i.e. which stay correct when the decoder already downscales.
+SCALE_NEUTRAL = {
+    "default",
+    "autorotate",
+    "process_jpeg",
+    "process_png",
+    "process_gif",
+    "preserve_icc_profile",
+    "force_jpeg",
+}
+
+
+def draft_size(processors):
+    """
+    Return a bounding box for draft-mode decoding if the given processors
+    provably only shrink the image, ``None`` otherwise.
+    """
+    sizes = []
+    for part in processors:
+        if isinstance(part, (list, tuple)):
+            if part[0] in {"thumbnail", "crop"} and len(part) == 2:
+                sizes.append(part[1])
+            else:
+                return None
+        elif part not in SCALE_NEUTRAL:
+            return None
+    if not sizes:
+        return None
+    # Decode to at least twice the largest target edge so that the final
+    # LANCZOS resize keeps its headroom; draft() only scales by powers of
+    # two and never below the requested size. The square bound also keeps
+    # autorotation safe.
+    edge = 2 * max(max(size) for size in sizes)
+    return (edge, edge)
+
 
 def build_handler(processors, handler=None):
     handler = handler or (lambda image, context: image)
@@ -33,25 +33,7 @@ class PreviewAndPPOIMixin(object):
         if not getattr(value, "name", ""):
             return widget
 
-        # Find our BoundField so that we may access the form instance to
-        # finally determine the ID attribute of our PPOI field.
-        frame = inspect.currentframe()
-        while frame:
-            boundfield = frame.f_locals.get("self")
-            if isinstance(boundfield, BoundField):
-                break
-            frame = frame.f_back
-
-        if frame is None:  # pragma: no cover
-            # Bail out. I have absolutely no idea why this would ever happen.
-            return widget
-
-        del frame
-
-        try:
-            ppoi = boundfield.form[boundfield.field.widget.ppoi_field].auto_id
-        except (AttributeError, KeyError, TypeError):
-            ppoi = ""
+        ppoi = self._ppoi_id(name, attrs)
 
         key = (
             "imagefield-admin-thumb:%s"
@@ -81,6 +63,41 @@ class PreviewAndPPOIMixin(object):
             ppoi=ppoi,
         )
 
+    def _ppoi_id(self, name, attrs):
+        if not getattr(self, "ppoi_field", None):
+            return ""
+
+        # The form applies the same auto_id pattern and prefix to all of its
+        # fields, so the PPOI field's ID can be derived from our own ID
+        # attribute by swapping the field name. This avoids walking the
+        # interpreter stack on every render.
+        id_ = (attrs or {}).get("id", "")
+        if id_.endswith(name):
+            field_name = name.rpartition("-")[2]
+            ppoi_name = name[: len(name) - len(field_name)] + self.ppoi_field
+            return id_[: len(id_) - len(name)] + ppoi_name
+
+        # No or an unexpected ID attribute; find our BoundField so that we
+        # may access the form instance to finally determine the ID attribute
+        # of our PPOI field.
+        frame = inspect.currentframe()
+        while frame:
+            boundfield = frame.f_locals.get("self")
+            if isinstance(boundfield, BoundField):
+                break
+            frame = frame.f_back
+
+        if frame is None:  # pragma: no cover
+            # Bail out. I have absolutely no idea why this would ever happen.
+            return ""
+
+        del frame
+
+        try:
+            return boundfield.form[boundfield.field.widget.ppoi_field].auto_id
+        except (AttributeError, KeyError, TypeError):
+            return ""
+
 
 def with_preview_and_ppoi(widget, **attrs):
     return type(
@@ -0,0 +1,67 @@
+import os
+
+from django.conf import settings
+from django.test import TestCase
+
+from PIL import Image
+
+from imagefield.processing import draft_size, register
+
+from .models import Model
+from .utils import BaseTest
+
+
+@register
+def no_draft(get_image):
+    # Not scale-neutral as far as draft_size() is concerned; otherwise a
+    # pass-through.
+    def processor(image, context):
+        return get_image(image, context)
+
+    return processor
+
+
+class DraftSizeTest(TestCase):
+    def test_shrinking_pipelines(self):
+        self.assertEqual(
+            draft_size(["default", ("thumbnail", (300, 225))]), (600, 600)
+        )
+        self.assertEqual(draft_size(["default", ("crop", (300, 300))]), (600, 600))
+        self.assertEqual(
+            draft_size([("thumbnail", (20, 20)), ("crop", (16, 16))]), (40, 40)
+        )
+
+    def test_custom_processors_bail_out(self):
+        self.assertIsNone(draft_size(["no_draft", ("thumbnail", (20, 20))]))
+        self.assertIsNone(draft_size([("watermark", "se"), ("crop", (20, 20))]))
+
+    def test_no_sizes(self):
+        self.assertIsNone(draft_size([]))
+        self.assertIsNone(draft_size(["default"]))
+        self.assertIsNone(draft_size(["default", "autorotate"]))
+
+
+class DraftProcessingTest(BaseTest):
+    def test_large_jpeg(self):
+        # Large enough that draft-mode decoding actually engages (the
+        # bundled fixtures are all smaller than the 2x-edge bound).
+        os.makedirs(os.path.join(settings.MEDIA_ROOT, "images"), exist_ok=True)
+        Image.new("RGB", (2400, 1800), "#3776ab").save(
+            os.path.join(settings.MEDIA_ROOT, "images", "large.jpg"), "JPEG"
+        )
+        m = Model(image="images/large.jpg", ppoi="0.5x0.5")
+
+        with Image.open(
+            m.image._process(processors=["default", ("thumbnail", (300, 225))])
+        ) as drafted, Image.open(
+            m.image._process(
+                processors=["no_draft", "default", ("thumbnail", (300, 225))]
+            )
+        ) as full:
+            self.assertEqual(drafted.size, (300, 225))
+            self.assertEqual(drafted.size, full.size)
+
+        with Image.open(
+            m.image._process(processors=["default", ("crop", (300, 300))])
+        ) as cropped:
+            self.assertEqual(cropped.size, (300, 300))
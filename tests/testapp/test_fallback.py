@@ -14,19 +14,19 @@ class FallbackTest(BaseTest):
         # self.assertEqual(m2.image.url, "/media/python-logo.tiff")
 
         self.assertEqual(
-            m1.image.thumb, "/media/__processed__/639/python-logo-2ebc6e32bcdb.jpg"
+            m1.image.thumb, "/media/__processed__/17f/python-logo-4675e8d7c142.jpg"
         )
 
         self.assertEqual(contents("__processed__"), [])
         m1.image.process("thumb")
-        self.assertEqual(contents("__processed__"), ["python-logo-2ebc6e32bcdb.jpg"])
+        self.assertEqual(contents("__processed__"), ["python-logo-4675e8d7c142.jpg"])
 
     def test_no_fallback(self):
         m2 = WebsafeImage.objects.create(image="python-logo.tiff")
         self.assertEqual(
-            m2.image.thumb, "/media/__processed__/639/python-logo-2ebc6e32bcdb.jpg"
+            m2.image.thumb, "/media/__processed__/17f/python-logo-4675e8d7c142.jpg"
         )
-        self.assertEqual(contents("__processed__"), ["python-logo-2ebc6e32bcdb.jpg"])
+        self.assertEqual(contents("__processed__"), ["python-logo-4675e8d7c142.jpg"])
 
     def test_delete_fallback(self):
         m1 = WebsafeImage.objects.create()
@@ -38,7 +38,7 @@ class ForcePNGTest(BaseTest):
         m = Model.objects.create(image="python-logo.jpg")
         self.assertEqual(
             "{}".format(m.image.test),
-            "/media/__processed__/d00/python-logo-5da93aa386ab.png",
+            "/media/__processed__/c64/python-logo-548a48558277.png",
         )
 
     def test_too_late(self):
@@ -58,7 +58,7 @@ class Test(BaseTest):
         self.assertContains(
             response,
             '<img class="imagefield-preview-image"'
-            ' src="/media/__processed__/beb/python-logo-6e3df744dc82.png"'
+            ' src="/media/__processed__/73b/python-logo-498a561c65a2.png"'
             ' alt=""/>',
         )
 
@@ -99,13 +99,13 @@ class Test(BaseTest):
 
         self.assertEqual(
             contents("__processed__"),
-            ["python-logo-24f8702383e7.png", "python-logo-e6a99ea713c8.png"],
+            ["python-logo-3875f95ab544.png", "python-logo-ddea9ce37e54.png"],
         )
 
         m = Model.objects.get()
         self.assertTrue(m.image.name)
         self.assertEqual(
-            m.image.thumb, "/media/__processed__/02a/python-logo-24f8702383e7.png"
+            m.image.thumb, "/media/__processed__/815/python-logo-ddea9ce37e54.png"
         )
         with self.assertRaises(AttributeError):
             m.image.not_exists
@@ -117,7 +117,7 @@ class Test(BaseTest):
         self.assertRedirects(response, "/admin/testapp/model/")
         self.assertEqual(
             contents("__processed__"),
-            ["python-logo-096bade32f42.png", "python-logo-2f5189af7eb3.png"],
+            ["python-logo-9d7b6d719bcb.png", "python-logo-d83088250ea2.png"],
         )
 
     def test_autorotate(self):
@@ -148,7 +148,7 @@ class Test(BaseTest):
             self.assertEqual(image.format, "JPEG")
             self.assertEqual(image.mode, "RGB")
 
-        self.assertEqual(contents("__processed__"), ["cmyk-e6a99ea713c8.jpg"])
+        self.assertEqual(contents("__processed__"), ["cmyk-3875f95ab544.jpg"])
         field._clear_generated_files(m)
         self.assertEqual(contents("__processed__"), [])
 
@@ -165,7 +165,7 @@ class Test(BaseTest):
             self.assertEqual(image.mode, "RGBA")
 
         self.assertEqual(
-            contents("__processed__"), ["python-logo-indexed-e6a99ea713c8.png"]
+            contents("__processed__"), ["python-logo-indexed-3875f95ab544.png"]
         )
         field._clear_generated_files(m)
         self.assertEqual(contents("__processed__"), [])
@@ -265,6 +265,14 @@ class Test(BaseTest):
         with override_settings(IMAGEFIELD_SILENTFAILURE=True):
             self.assertEqual(m.image.process("desktop"), "smallliz.tif")
 
+    def test_silent_failure_missing_file(self):
+        """Missing source files do not break saving with silent failure"""
+        with override_settings(IMAGEFIELD_SILENTFAILURE=True):
+            m = Model.objects.create(
+                image="does-not-exist.png", width=100, height=100, ppoi="0.5x0.5"
+            )
+        self.assertEqual(m.image.name, "does-not-exist.png")
+
     def test_cmyk_validation(self):
         """
         Test that the image verification can handle CMYK images.
@@ -282,11 +290,11 @@ class Test(BaseTest):
         m = Model.objects.create(image="python-logo.jpg")
         self.assertEqual(
             contents("__processed__"),
-            ["python-logo-24f8702383e7.jpg", "python-logo-e6a99ea713c8.jpg"],
+            ["python-logo-3875f95ab544.jpg", "python-logo-ddea9ce37e54.jpg"],
         )
         self.assertEqual(
             m.image.process([("thumbnail", (20, 20))]),
-            "__processed__/d00/python-logo-43feb031c1be.jpg",
+            "__processed__/c64/python-logo-f13f8b39fc54.jpg",
         )
 
         # Same result when using a callable as processor spec:
@@ -294,14 +302,14 @@ class Test(BaseTest):
             context.processors = [("thumbnail", (20, 20))]
 
         self.assertEqual(
-            m.image.process(spec), "__processed__/d00/python-logo-43feb031c1be.jpg"
+            m.image.process(spec), "__processed__/c64/python-logo-f13f8b39fc54.jpg"
         )
         self.assertEqual(
             contents("__processed__"),
             [
-                "python-logo-24f8702383e7.jpg",
-                "python-logo-43feb031c1be.jpg",
-                "python-logo-e6a99ea713c8.jpg",
+                "python-logo-3875f95ab544.jpg",
+                "python-logo-ddea9ce37e54.jpg",
+                "python-logo-f13f8b39fc54.jpg",
             ],
         )
         m.delete()
@@ -314,7 +322,7 @@ class Test(BaseTest):
         # New thumb is not saved; still only "desktop" and "thumbnail" images
         self.assertEqual(
             contents("__processed__"),
-            ["python-logo-24f8702383e7.jpg", "python-logo-e6a99ea713c8.jpg"],
+            ["python-logo-3875f95ab544.jpg", "python-logo-ddea9ce37e54.jpg"],
         )
 
     @skipIf(sys.version_info[0] < 3, "time.monotonic only with Python>=3.3")
@@ -328,7 +336,7 @@ class Test(BaseTest):
         start = time.monotonic()
         m = SlowStorageImage.objects.get()
         self.assertEqual(
-            m.image.thumb, "/media/__processed__/d00/python-logo-10c070f1761f.jpg"
+            m.image.thumb, "/media/__processed__/c64/python-logo-ad551d41dc3b.jpg"
         )
         duration = time.monotonic() - start
         # No opens, no saves
@@ -351,18 +359,18 @@ class Test(BaseTest):
         thumb = m.image.thumbnail["20x20"]
         self.assertEqual(
             contents("__processed__"),
-            ["python-logo-24f8702383e7.jpg", "python-logo-e6a99ea713c8.jpg"],
+            ["python-logo-3875f95ab544.jpg", "python-logo-ddea9ce37e54.jpg"],
         )
         self.assertEqual(thumb.items, ["thumbnail", "20x20"])
         self.assertEqual(
-            "{}".format(thumb), "/media/__processed__/d00/python-logo-f26eb6811b04.jpg"
+            "{}".format(thumb), "/media/__processed__/c64/python-logo-2358efc4a564.jpg"
         )
         self.assertEqual(
             contents("__processed__"),
             [
-                "python-logo-24f8702383e7.jpg",
-                "python-logo-e6a99ea713c8.jpg",
-                "python-logo-f26eb6811b04.jpg",
+                "python-logo-2358efc4a564.jpg",
+                "python-logo-3875f95ab544.jpg",
+                "python-logo-ddea9ce37e54.jpg",
             ],
         )
 
@@ -374,30 +382,30 @@ class Test(BaseTest):
     def test_already_websafe(self):
         # Same as above!
         WebsafeImage.objects.create(image="python-logo.jpg")
-        self.assertEqual(contents("__processed__"), ["python-logo-24f8702383e7.jpg"])
+        self.assertEqual(contents("__processed__"), ["python-logo-ddea9ce37e54.jpg"])
 
     def test_websafe_force_jpeg(self):
         WebsafeImage.objects.create(image="python-logo.tiff")
-        self.assertEqual(contents("__processed__"), ["python-logo-2ebc6e32bcdb.jpg"])
+        self.assertEqual(contents("__processed__"), ["python-logo-4675e8d7c142.jpg"])
 
     def test_websafe_gif(self):
         WebsafeImage.objects.create(image="python-logo.gif")
-        self.assertEqual(contents("__processed__"), ["python-logo-24f8702383e7.gif"])
+        self.assertEqual(contents("__processed__"), ["python-logo-ddea9ce37e54.gif"])
 
     @override_settings(IMAGEFIELD_VERSATILEIMAGEPROXY="websafe")
     def test_websafe_versatileimageproxy(self):
         m = WebsafeImage.objects.create(image="python-logo.tiff")
         self.assertEqual(
             "{}".format(m.image.crop["300x300"]),
-            "/media/__processed__/639/python-logo-2ebc6e32bcdb.jpg",
+            "/media/__processed__/17f/python-logo-4675e8d7c142.jpg",
         )
 
     def test_force_does_overwrite(self):
         m = Model(image="python-logo.jpg")
         m.image.process("thumb")
-        self.assertEqual(contents("__processed__"), ["python-logo-24f8702383e7.jpg"])
+        self.assertEqual(contents("__processed__"), ["python-logo-ddea9ce37e54.jpg"])
         m.image.process("thumb", force=True)
-        self.assertEqual(contents("__processed__"), ["python-logo-24f8702383e7.jpg"])
+        self.assertEqual(contents("__processed__"), ["python-logo-ddea9ce37e54.jpg"])
 
     def test_completely_bogus(self):
         client = self.login()
@@ -423,7 +431,7 @@ class Test(BaseTest):
 
         self.assertEqual(
             contents("__processed__"),
-            ["python-logo-24f8702383e7.png", "python-logo-e6a99ea713c8.png"],
+            ["python-logo-3875f95ab544.png", "python-logo-ddea9ce37e54.png"],
         )
 
     def test_pickle(self):
@@ -436,13 +444,13 @@ class Test(BaseTest):
     def test_deferred_imagefields(self):
         """Deferring imagefields shouldn't leave old processed images on the disk"""
         WebsafeImage.objects.create(image="python-logo.jpg")
-        self.assertEqual(contents("__processed__"), ["python-logo-24f8702383e7.jpg"])
+        self.assertEqual(contents("__processed__"), ["python-logo-ddea9ce37e54.jpg"])
 
         m1 = WebsafeImage.objects.defer("image").get()
         m1.image = "cmyk.jpg"
         m1.save()
-        self.assertEqual(contents("__processed__"), ["cmyk-24f8702383e7.jpg"])
-        # ["cmyk-24f8702383e7.jpg", "python-logo-24f8702383e7.jpg"],
+        self.assertEqual(contents("__processed__"), ["cmyk-ddea9ce37e54.jpg"])
+        # ["cmyk-ddea9ce37e54.jpg", "python-logo-ddea9ce37e54.jpg"],
 
     def test_context(self):
         self.assertTrue(isinstance(Context.ppoi, _SealableAttribute))